@@ -2,20 +2,30 @@
 # /// script
 # requires-python = ">=3.10"
 # dependencies = [
-#     "textual>=0.47.0",
+#     "textual>=7.0.2",
 # ]
 # ///
 """Textual TUI for simple-devenv - Odoo development environment setup."""
 
+import asyncio
+import json
 import os
+import re
+import shutil
+import signal
 import subprocess
+import sys
+import time
+from collections import OrderedDict
 from pathlib import Path
+from typing import Iterable, Iterator
 
-from textual import on
+from textual import on, work
 from textual.app import App, ComposeResult
 from textual.binding import Binding
 from textual.containers import Container, Horizontal, Vertical, VerticalScroll
 from textual.screen import ModalScreen
+from textual.timer import Timer
 from textual.widgets import (
     Button,
     Checkbox,
@@ -28,16 +38,162 @@ from textual.widgets import (
     OptionList,
     Select,
     Static,
+    Tree,
 )
+from textual.widgets.directory_tree import DirEntry
 from textual.widgets.option_list import Option
+from textual.widgets.tree import TreeNode
+from textual.worker import Worker, get_current_worker
+
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # orjson is an optional speedup
+    _json_loads = json.loads
+
+try:
+    import ijson
+except ImportError:  # ijson is optional, used to stream-parse gh output
+    ijson = None
+
+_PROJECT_NAME_RE = re.compile(r"[A-Za-z0-9_-]+")
+_ANSI_ESCAPE_RE = re.compile(r"\x1b\[[0-9;?]*[A-Za-z]")
+_CACHE_PATH = Path.home() / ".cache" / "simple-devenv" / "repos.json"
+_CACHE_TTL = 600  # seconds
+_PREFETCH_LIMIT = 128
+
+# Run create.sh in its own process group so it can be stopped as a whole.
+# A new session would also drop the controlling terminal, which sudo's
+# credential cache (primed with `sudo -v`) is tied to.
+if sys.version_info >= (3, 11):
+    _OWN_PROCESS_GROUP = {"process_group": 0}
+else:
+    _OWN_PROCESS_GROUP = {"preexec_fn": os.setpgrp}
+
+
+def _load_cached_repos() -> list[tuple[str, str]] | None:
+    """Return cached (name, url) repos, or None if missing, stale or unreadable."""
+    try:
+        if time.time() - _CACHE_PATH.stat().st_mtime > _CACHE_TTL:
+            return None
+        return [(name, url) for name, url in _json_loads(_CACHE_PATH.read_bytes())]
+    except (OSError, TypeError, ValueError):
+        return None
+
+
+def _save_cached_repos(repos: list[tuple[str, str]]) -> None:
+    try:
+        _CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        _CACHE_PATH.write_text(json.dumps([[name, url] for name, url in repos]))
+    except OSError:
+        pass  # Caching is best-effort
 
 
 class FilteredDirectoryTree(DirectoryTree):
-    """DirectoryTree that filters out hidden folders."""
+    """DirectoryTree that filters out hidden folders.
 
-    def filter_paths(self, paths: list[Path]) -> list[Path]:
+    Listing hooks into DirectoryTree internals (_directory_content,
+    _safe_is_dir, _populate_node and DirEntry.loaded), checked against
+    Textual 7.0.2.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        # Directory flags gathered by scandir, so sorting and populating
+        # nodes doesn't stat every entry again. Entries only live until the
+        # listing is added to the tree; later checks stat the path again.
+        self._is_dir_cache: dict[Path, bool] = {}
+        # Recently prefetched directories, oldest first
+        self._prefetched: OrderedDict[Path, None] = OrderedDict()
+
+    def filter_paths(self, paths: Iterable[Path]) -> list[Path]:
         return [p for p in paths if not p.name.startswith(".")]
 
+    def _directory_content(self, location: Path, worker: Worker) -> Iterator[Path]:
+        # Drop flags left over from an earlier, unfinished listing of this location
+        for path in [p for p in self._is_dir_cache if p.parent == location]:
+            del self._is_dir_cache[path]
+        try:
+            with os.scandir(location) as entries:
+                for entry in entries:
+                    if worker.is_cancelled:
+                        break
+                    if entry.name.startswith("."):
+                        continue
+                    path = Path(entry.path)
+                    try:
+                        self._is_dir_cache[path] = entry.is_dir()
+                    except OSError:
+                        self._is_dir_cache[path] = False
+                    yield path
+        except PermissionError:
+            pass
+
+    def _safe_is_dir(self, path: Path) -> bool:
+        is_dir = self._is_dir_cache.get(path)
+        if is_dir is None:
+            return super()._safe_is_dir(path)
+        return is_dir
+
+    def _populate_node(self, node: TreeNode[DirEntry], content: Iterable[Path]) -> None:
+        super()._populate_node(node, content)
+        for path in content:
+            self._is_dir_cache.pop(path, None)
+
+    def add_directory(self, parent: TreeNode[DirEntry], path: Path) -> TreeNode[DirEntry] | None:
+        """Insert a newly created directory under a node without reloading the tree.
+
+        Returns the new node, or None if the path is filtered out or the parent
+        hasn't been loaded yet (its content will then be read when it is first
+        expanded).
+        """
+        if parent.data is None or not parent.data.loaded:
+            return None
+        if not self.filter_paths([path]):
+            return None
+        key = path.name.lower()
+        before = None
+        for child in parent.children:
+            if child.data is None:
+                continue
+            if child.data.path.name == path.name:
+                return child
+            # Directories come first, each group sorted by lowercased name
+            if not child.allow_expand or child.data.path.name.lower() > key:
+                before = child
+                break
+        return parent.add(path.name, data=DirEntry(path), before=before, allow_expand=True)
+
+    def on_tree_node_highlighted(self, event: Tree.NodeHighlighted[DirEntry]) -> None:
+        """Scan the highlighted directory ahead of time so expanding it is quick."""
+        data = event.node.data
+        if data is None or data.loaded or event.node.is_expanded:
+            return
+        if data.path in self._prefetched:
+            self._prefetched.move_to_end(data.path)
+            return
+        if not event.node.allow_expand:
+            return
+        self._prefetch(data.path)
+
+    @work(thread=True, exclusive=True, group="prefetch", exit_on_error=False)
+    def _prefetch(self, path: Path) -> None:
+        worker = get_current_worker()
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if worker.is_cancelled:
+                        return
+                    entry.is_dir()
+        except OSError:
+            pass
+        # Only remember scans that ran to the end; cancelled ones may be retried
+        self.app.call_from_thread(self._mark_prefetched, path)
+
+    def _mark_prefetched(self, path: Path) -> None:
+        self._prefetched[path] = None
+        if len(self._prefetched) > _PREFETCH_LIMIT:
+            self._prefetched.popitem(last=False)
+
 
 class DirectoryPickerScreen(ModalScreen[Path | None]):
     """Modal screen for picking a directory."""
@@ -95,6 +251,10 @@ class DirectoryPickerScreen(ModalScreen[Path | None]):
         super().__init__()
         self.start_path = start_path or Path.home()
         self.selected_path: Path | None = None
+        self.selected_node: TreeNode[DirEntry] | None = None
+        # True when the selected path sits below a node whose content hasn't
+        # been loaded yet, so there is nothing in the tree to update
+        self._selected_unloaded = False
 
     def compose(self) -> ComposeResult:
         with Container():
@@ -116,6 +276,8 @@ class DirectoryPickerScreen(ModalScreen[Path | None]):
     @on(DirectoryTree.DirectorySelected)
     def on_directory_selected(self, event: DirectoryTree.DirectorySelected) -> None:
         self.selected_path = event.path
+        self.selected_node = event.node
+        self._selected_unloaded = False
         self.query_one("#selected-path", Static).update(f"Selected: {event.path}")
 
     @on(Button.Pressed, "#create-folder-btn")
@@ -126,15 +288,27 @@ class DirectoryPickerScreen(ModalScreen[Path | None]):
 
         parent = self.selected_path or self.start_path
         new_path = parent / folder_name
+        tree = self.query_one(FilteredDirectoryTree)
+        parent_node = self.selected_node if self.selected_path else tree.root
 
         try:
             new_path.mkdir(parents=True, exist_ok=True)
             self.selected_path = new_path
             self.query_one("#selected-path", Static).update(f"Created & Selected: {new_path}")
             self.query_one("#new-folder-input", Input).value = ""
-            # Reload the tree
-            tree = self.query_one(FilteredDirectoryTree)
-            tree.reload()
+            # Add the new folder to the tree instead of rescanning everything
+            if self._selected_unloaded:
+                pass  # Picked up when the unloaded ancestor is first expanded
+            elif parent_node is None:
+                tree.reload()
+            elif new_path.parent == parent:
+                self.selected_node = tree.add_directory(parent_node, new_path)
+                self._selected_unloaded = self.selected_node is None
+            else:
+                # Nested folder name: only the parent needs rescanning
+                self.selected_node = None
+                self._selected_unloaded = True
+                tree.reload_node(parent_node)
         except OSError as e:
             self.query_one("#selected-path", Static).update(f"Error: {e}")
 
@@ -193,13 +367,24 @@ class RepoPickerScreen(ModalScreen[str | None]):
         super().__init__()
         self.repos = repos  # List of (name, url) tuples
         self.filtered_repos = repos.copy()
+        # Lowercased names computed once so filtering doesn't redo it per keystroke
+        self._repos_lc = [(name.lower(), name, url) for name, url in repos]
+        # Trigram -> indices into _repos_lc, to narrow candidates for longer queries
+        self._trigrams: dict[str, set[int]] = {}
+        for i, (name_lc, _, _) in enumerate(self._repos_lc):
+            for j in range(len(name_lc) - 2):
+                self._trigrams.setdefault(name_lc[j:j + 3], set()).add(i)
+        # Matches for the previous query, for narrowing as the user keeps typing
+        self._prev_query = ""
+        self._filtered_lc = self._repos_lc
         self.selected_url: str | None = None
+        self._filter_timer: Timer | None = None
 
     def compose(self) -> ComposeResult:
         with Container():
             yield Label("Select Repository (type to filter)")
             yield Input(placeholder="Search repos...", id="search-input")
-            yield OptionList(*[Option(name, id=url) for name, url in self.repos], id="repo-list")
+            yield OptionList(id="repo-list")
             with Horizontal(id="button-row"):
                 yield Button("Select", variant="primary", id="select-btn")
                 yield Button("Clear", variant="warning", id="clear-btn")
@@ -207,20 +392,49 @@ class RepoPickerScreen(ModalScreen[str | None]):
 
     def on_mount(self) -> None:
         self.query_one("#search-input", Input).focus()
+        # Fill the list after the first paint so the modal appears immediately
+        self.call_after_refresh(self._populate_options)
+
+    def _populate_options(self) -> None:
+        option_list = self.query_one("#repo-list", OptionList)
+        option_list.add_options([Option(name, id=url) for name, url in self.repos])
+        if self.repos:
+            option_list.highlighted = 0
+
+    def on_unmount(self) -> None:
+        if self._filter_timer is not None:
+            self._filter_timer.stop()
 
     @on(Input.Changed, "#search-input")
     def on_search_changed(self, event: Input.Changed) -> None:
-        search_term = event.value.lower()
-        option_list = self.query_one("#repo-list", OptionList)
-        option_list.clear_options()
+        # Debounce: only filter once typing has paused
+        if self._filter_timer is not None:
+            self._filter_timer.stop()
+        value = event.value
+        self._filter_timer = self.set_timer(0.2, lambda: self._apply_filter(value))
+
+    def _apply_filter(self, search_term: str) -> None:
+        search_term = search_term.lower()
+        if self._prev_query and search_term.startswith(self._prev_query):
+            # Extending the query can only narrow the previous matches
+            source = self._filtered_lc
+        elif len(search_term) >= 3:
+            candidates = set.intersection(*(
+                self._trigrams.get(search_term[j:j + 3], set())
+                for j in range(len(search_term) - 2)
+            ))
+            source = [self._repos_lc[i] for i in sorted(candidates)]
+        else:
+            source = self._repos_lc
 
-        self.filtered_repos = [
-            (name, url) for name, url in self.repos
-            if search_term in name.lower()
-        ]
+        self._filtered_lc = [repo for repo in source if search_term in repo[0]]
+        self.filtered_repos = [(name, url) for _, name, url in self._filtered_lc]
+        self._prev_query = search_term
 
-        for name, url in self.filtered_repos:
-            option_list.add_option(Option(name, id=url))
+        # Replace the options in a single batch so the list only refreshes once
+        self.query_one("#repo-list", OptionList).set_options(
+            [Option(name, id=url) for name, url in self.filtered_repos]
+        )
 
     @on(OptionList.OptionSelected)
     def on_option_selected(self, event: OptionList.OptionSelected) -> None:
@@ -252,6 +466,7 @@ class SimpleDevEnvApp(App):
     BINDINGS = [
         Binding("q", "quit", "Quit"),
         Binding("ctrl+c", "quit", "Quit"),
+        Binding("r", "refresh_repos", "Refresh Repos"),
     ]
 
     CSS = """
@@ -367,8 +582,14 @@ class SimpleDevEnvApp(App):
     def __init__(self) -> None:
         super().__init__()
         self.script_dir = Path(__file__).parent.resolve()
+        self._script_dir_str = str(self.script_dir)
+        self._base_env = dict(os.environ)
         self.target_dir = Path.home() / "odoo_projects"
         self.github_repos: list[tuple[str, str]] = []
+        self._repo_name_by_url: dict[str, str] = {}
+        self._gh_path = shutil.which("gh")
+        self._setup_proc: subprocess.Popen[str] | None = None
+        self._cancel_requested = False
         self.selected_repo: str = ""
 
     def compose(self) -> ComposeResult:
@@ -426,7 +647,18 @@ class SimpleDevEnvApp(App):
         yield Footer()
 
     def on_mount(self) -> None:
-        self.query_one("#project-name", Input).focus()
+        # Keep handles to widgets used by handlers, avoiding a DOM query per call
+        self._project_name = self.query_one("#project-name", Input)
+        self._odoo_version = self.query_one("#odoo-version", Select)
+        self._db_name = self.query_one("#db-name", Input)
+        self._precommit = self.query_one("#precommit", Checkbox)
+        self._status_bar = self.query_one("#status-bar", Static)
+        self._log_view = self.query_one("#log", Log)
+        self._target_display = self.query_one("#target-dir-display", Static)
+        self._repo_display = self.query_one("#repo-display", Static)
+        self._select_repo_btn = self.query_one("#select-repo-btn", Button)
+        self._create_btn = self.query_one("#create-btn", Button)
+        self._project_name.focus()
 
     @on(Button.Pressed, "#browse-btn")
     def on_browse(self) -> None:
@@ -437,81 +669,140 @@ class SimpleDevEnvApp(App):
     def on_directory_picked(self, path: Path | None) -> None:
         if path is not None:
             self.target_dir = path
-            self.query_one("#target-dir-display", Static).update(str(path))
+            self._target_display.update(str(path))
+
+    async def _fetch_repos(self, *owner: str) -> list[tuple[str, str]] | None:
+        """List repos via gh without blocking the event loop.
+
+        Output is parsed incrementally with ijson when it is installed.
+        Returns None if gh exits with an error.
+        """
+        proc = await asyncio.create_subprocess_exec(
+            self._gh_path, "repo", "list", *owner, "--limit", "100", "--json", "nameWithOwner,url",
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        if ijson is None:
+            stdout, _ = await proc.communicate()
+            if proc.returncode != 0:
+                return None
+            repos = _json_loads(stdout)
+            return [(r["nameWithOwner"], r["url"]) for r in repos]
+
+        repos = []
+        parsed = False
+        try:
+            async for r in ijson.items(proc.stdout, "item"):
+                repos.append((r["nameWithOwner"], r["url"]))
+            parsed = True
+        except ijson.JSONError:
+            # A failed gh run usually leaves no (or truncated) output
+            if await proc.wait() != 0:
+                return None
+            raise
+        finally:
+            # Never leave gh running or unreaped, whatever went wrong above
+            if not parsed and proc.returncode is None:
+                proc.kill()
+            await proc.wait()
+        if proc.returncode != 0:
+            return None
+        return repos
 
     @on(Button.Pressed, "#select-repo-btn")
     def on_select_repo(self) -> None:
         """Open repo picker, loading repos if needed."""
         if not self.github_repos:
-            self.update_status("Loading GitHub repos...")
-            try:
-                import json
-                all_repos = []
-
-                # Load personal repos
-                result = subprocess.run(
-                    ["gh", "repo", "list", "--limit", "100", "--json", "nameWithOwner,url"],
-                    capture_output=True,
-                    text=True,
-                )
-                if result.returncode == 0:
-                    repos = json.loads(result.stdout)
-                    all_repos.extend([(r["nameWithOwner"], r["url"]) for r in repos])
-
-                # Load AbstractiveOdooPartner org repos
-                result = subprocess.run(
-                    ["gh", "repo", "list", "AbstractiveOdooPartner", "--limit", "100", "--json", "nameWithOwner,url"],
-                    capture_output=True,
-                    text=True,
-                )
-                if result.returncode == 0:
-                    repos = json.loads(result.stdout)
-                    all_repos.extend([(r["nameWithOwner"], r["url"]) for r in repos])
+            self.github_repos = _load_cached_repos() or []
+            self._repo_name_by_url = {url: name for name, url in self.github_repos}
 
-                if not all_repos:
-                    self.update_status("Failed to load repos. Is gh authenticated?", error=True)
-                    return
+        if self.github_repos:
+            self.push_screen(RepoPickerScreen(self.github_repos), self.on_repo_picked)
+            return
 
-                # Remove duplicates and sort
-                self.github_repos = sorted(set(all_repos), key=lambda x: x[0].lower())
-                self.update_status(f"Loaded {len(self.github_repos)} repos")
+        if self._gh_path is None:
+            self.update_status("gh CLI not found. Install it from https://cli.github.com", error=True)
+            return
+        self.update_status("Loading GitHub repos...")
+        self._select_repo_btn.disabled = True
+        self._load_repos()
 
-            except FileNotFoundError:
-                self.update_status("gh CLI not found. Install it from https://cli.github.com", error=True)
-                return
-            except Exception as e:
-                self.update_status(f"Error loading repos: {e}", error=True)
+    @work(exclusive=True, group="repos")
+    async def _load_repos(self) -> None:
+        """Load repos from GitHub in a worker so the UI keeps handling input, then open the picker."""
+        try:
+            # Load personal and AbstractiveOdooPartner org repos concurrently
+            personal, org = await asyncio.gather(
+                self._fetch_repos(),
+                self._fetch_repos("AbstractiveOdooPartner"),
+            )
+            all_repos = (personal or []) + (org or [])
+
+            if not all_repos:
+                self.update_status("Failed to load repos. Is gh authenticated?", error=True)
                 return
 
+            # Remove duplicates (by URL) and sort case-insensitively
+            names_by_url: dict[str, str] = {}
+            for name, url in all_repos:
+                names_by_url.setdefault(url, name)
+            keyed = sorted((name.lower(), name, url) for url, name in names_by_url.items())
+            self.github_repos = [(name, url) for _, name, url in keyed]
+            self._repo_name_by_url = names_by_url
+            if personal is None or org is None:
+                # Don't persist a partial list; pressing r retries the load
+                missing = "personal" if personal is None else "AbstractiveOdooPartner"
+                self.update_status(
+                    f"Loaded {len(self.github_repos)} repos ({missing} repos could not be loaded)",
+                    error=True,
+                )
+            else:
+                _save_cached_repos(self.github_repos)
+                self.update_status(f"Loaded {len(self.github_repos)} repos")
+
+        except Exception as e:
+            self.update_status(f"Error loading repos: {e}", error=True)
+            return
+        finally:
+            self._select_repo_btn.disabled = False
+
         self.push_screen(RepoPickerScreen(self.github_repos), self.on_repo_picked)
 
+    def action_refresh_repos(self) -> None:
+        """Drop cached repos so the next picker open reloads them from GitHub."""
+        self.github_repos = []
+        try:
+            _CACHE_PATH.unlink(missing_ok=True)
+        except OSError:
+            pass  # Caching is best-effort
+        self.update_status("Repo list will be reloaded on next selection")
+
     def on_repo_picked(self, url: str | None) -> None:
         """Handle repo selection from picker."""
         if url is None:
             return  # Cancelled
         self.selected_repo = url
         if url:
-            # Find the name for this URL
-            name = next((n for n, u in self.github_repos if u == url), url)
-            self.query_one("#repo-display", Static).update(name)
+            name = self._repo_name_by_url.get(url, url)
+            self._repo_display.update(name)
         else:
-            self.query_one("#repo-display", Static).update("(none)")
+            self._repo_display.update("(none)")
 
     @on(Button.Pressed, "#create-btn")
     def on_create(self) -> None:
-        project_name = self.query_one("#project-name", Input).value.strip()
-        odoo_version = self.query_one("#odoo-version", Select).value
-        db_name = self.query_one("#db-name", Input).value.strip()
-        install_precommit = self.query_one("#precommit", Checkbox).value
+        project_name = self._project_name.value.strip()
+        odoo_version = self._odoo_version.value
+        db_name = self._db_name.value.strip()
+        install_precommit = self._precommit.value
         clone_repo = self.selected_repo
 
         # Validation
         if not project_name:
             self.update_status("Please enter a project name", error=True)
-            self.query_one("#project-name", Input).focus()
+            self._project_name.focus()
             return
 
-        if not project_name.replace("-", "").replace("_", "").isalnum():
+        if not _PROJECT_NAME_RE.fullmatch(project_name):
             self.update_status(
                 "Project name should only contain letters, numbers, - and _",
                 error=True,
@@ -523,7 +814,7 @@ class SimpleDevEnvApp(App):
     def run_setup(
         self, project_name: str, odoo_version: str, db_name: str, install_precommit: bool, clone_repo: str
     ) -> None:
-        """Run the setup script, suspending TUI for interactive terminal access."""
+        """Run the setup script, streaming its output into the log."""
         script_path = self.script_dir / "create.sh"
 
         if not script_path.exists():
@@ -531,58 +822,140 @@ class SimpleDevEnvApp(App):
             return
 
         # Set environment variables
-        env = os.environ.copy()
-        env["BASE_PATH"] = str(self.target_dir)
+        overrides = {"BASE_PATH": str(self.target_dir)}
         if db_name:
-            env["DB_NAME"] = db_name
+            overrides["DB_NAME"] = db_name
         if install_precommit:
-            env["INSTALL_PRECOMMIT"] = "1"
+            overrides["INSTALL_PRECOMMIT"] = "1"
         if clone_repo:
-            env["CLONE_REPO"] = clone_repo
-
-        # Suspend TUI and run script interactively
-        with self.suspend():
-            print(f"\n{'='*60}")
-            print(f"Setting up {project_name} with Odoo {odoo_version}")
-            print(f"Target: {self.target_dir}")
-            if clone_repo:
-                print(f"Clone repo: {clone_repo}")
-            print(f"{'='*60}\n")
-
-            result = subprocess.run(
+            overrides["CLONE_REPO"] = clone_repo
+        # Make git/ssh fail instead of prompting on the terminal Textual is drawing on
+        overrides["GIT_TERMINAL_PROMPT"] = "0"
+        overrides["GIT_SSH_COMMAND"] = f"{self._base_env.get('GIT_SSH_COMMAND', 'ssh')} -o BatchMode=yes"
+        env = self._base_env | overrides
+
+        # The script uses sudo, so unless credentials are already cached ask
+        # for the password up front in the real terminal; the streamed run
+        # below has no terminal to prompt on
+        try:
+            sudo = subprocess.run(
+                ["sudo", "-n", "true"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+            )
+            if sudo.returncode != 0:
+                with self.suspend():
+                    print("Setup needs sudo access to install system packages.")
+                    sudo = subprocess.run(["sudo", "-v"])
+        except FileNotFoundError:
+            self.update_status("sudo not found, it is required to install system packages", error=True)
+            return
+        if sudo.returncode != 0:
+            self.update_status("Could not obtain sudo access", error=True)
+            return
+
+        self._log_view.clear()
+        self._log_view.write_line("=" * 60)
+        self._log_view.write_line(f"Setting up {project_name} with Odoo {odoo_version}")
+        self._log_view.write_line(f"Target: {self.target_dir}")
+        if clone_repo:
+            self._log_view.write_line(f"Clone repo: {clone_repo}")
+        self._log_view.write_line("=" * 60)
+
+        self._create_btn.disabled = True
+        self._cancel_requested = False
+        self.update_status(f"Setting up {project_name}...")
+        self._run_script(script_path, project_name, odoo_version, env)
+
+    @work(exclusive=True, thread=True, exit_on_error=False)
+    def _run_script(
+        self, script_path: Path, project_name: str, odoo_version: str, env: dict[str, str]
+    ) -> None:
+        """Run create.sh in a worker thread, forwarding each output line to the log."""
+        try:
+            self._setup_proc = proc = subprocess.Popen(
                 ["bash", str(script_path), project_name, odoo_version],
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                bufsize=1,
+                text=True,
+                errors="replace",
                 env=env,
-                cwd=str(self.script_dir),
+                cwd=self._script_dir_str,
+                **_OWN_PROCESS_GROUP,
             )
-
-            print(f"\n{'='*60}")
-            if result.returncode == 0:
-                print("Setup completed successfully!")
-            else:
-                print(f"Setup failed with exit code {result.returncode}")
-            print("Press Enter to return to the TUI...")
-            input()
-
-        # Update status after returning
-        log = self.query_one("#log", Log)
-        log.clear()
-        if result.returncode == 0:
-            log.write_line(f"Setup completed for {project_name}")
+        except OSError as e:
+            self.call_from_thread(self._on_setup_error, e)
+            return
+        try:
+            for line in proc.stdout:
+                # The Log widget shows escape codes literally, so drop create.sh's colours
+                self.call_from_thread(self._log_view.write_line, _ANSI_ESCAPE_RE.sub("", line.rstrip()))
+            returncode = proc.wait()
+        finally:
+            self._setup_proc = None
+        self.call_from_thread(self._on_setup_finished, project_name, returncode)
+
+    def _on_setup_error(self, error: Exception) -> None:
+        self._log_view.write_line(f"Could not run setup script: {error}")
+        self.update_status(f"Error running setup: {error}", error=True)
+        self._create_btn.disabled = False
+
+    def _on_setup_finished(self, project_name: str, returncode: int) -> None:
+        self._log_view.write_line("=" * 60)
+        if returncode == 0:
+            self._log_view.write_line(f"Setup completed for {project_name}")
             self.update_status("Environment created successfully!", success=True)
+        elif self._cancel_requested:
+            self._log_view.write_line("Setup cancelled")
+            self.update_status("Setup cancelled", error=True)
         else:
-            log.write_line(f"Setup failed with exit code {result.returncode}")
-            self.update_status(f"Setup failed (exit code {result.returncode})", error=True)
+            self._log_view.write_line(f"Setup failed with exit code {returncode}")
+            self.update_status(f"Setup failed (exit code {returncode})", error=True)
+        self._create_btn.disabled = False
+
+    async def action_quit(self) -> None:
+        # Quitting would orphan create.sh halfway through an install, so the
+        # first press only warns and a second one cancels the setup
+        if self._setup_proc is not None:
+            if self._cancel_requested:
+                self._signal_setup(signal.SIGTERM)
+                self.update_status("Cancelling setup...", error=True)
+            else:
+                self._cancel_requested = True
+                self.update_status("Setup is still running, press q again to cancel it", error=True)
+            return
+        await super().action_quit()
+
+    def _signal_setup(self, signum: int) -> None:
+        """Send a signal to create.sh and everything it started."""
+        proc = self._setup_proc
+        if proc is None:
+            return
+        try:
+            os.killpg(proc.pid, signum)
+        except (ProcessLookupError, PermissionError):
+            pass
+
+    def on_unmount(self) -> None:
+        # Last resort if the app is shut down some other way mid-setup
+        proc = self._setup_proc
+        if proc is not None:
+            self._signal_setup(signal.SIGTERM)
+            try:
+                proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self._signal_setup(signal.SIGKILL)
+                proc.wait()
 
     def update_status(
         self, message: str, error: bool = False, success: bool = False
     ) -> None:
-        status_bar = self.query_one("#status-bar", Static)
         if error:
-            status_bar.update(f"[bold red]{message}[/]")
+            self._status_bar.update(f"[bold red]{message}[/]")
         elif success:
-            status_bar.update(f"[bold green]{message}[/]")
+            self._status_bar.update(f"[bold green]{message}[/]")
         else:
-            status_bar.update(f"[bold]{message}[/]")
+            self._status_bar.update(f"[bold]{message}[/]")
 
 
 def main() -> None: